@@ -0,0 +1,123 @@
+"""
+Shared Chrome browser handling for the searcher and the downloader.
+
+Starting undetected Chrome takes several seconds, so idle browsers are
+kept in a process-wide pool and handed out again by acquire_driver.
+A browser that has passed the age verification keeps its cookies in the
+pool, so a download following a search in the same process does not have
+to verify again.
+"""
+
+import os
+import ssl
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+# Workaround for SSL certificate issues on macOS, where undetected_chromedriver
+# fails to download chromedriver. This disables certificate verification for
+# the whole process, so it is only applied when asked for
+if os.environ.get('EPSCRAPER_INSECURE_SSL'):
+    ssl._create_default_https_context = ssl._create_unverified_context
+
+
+__all__ = ['create_driver', 'quit_driver', 'acquire_driver']
+
+
+# Idle browsers kept warm between uses, one pool per headless mode
+_DRIVER_POOLS = {True: queue.Queue(), False: queue.Queue()}
+
+# undetected_chromedriver patches the shared chromedriver binary while
+# starting up, so browsers are started one at a time
+_CREATE_LOCK = threading.Lock()
+
+
+def create_driver(headless=False, user_data_dir=None):
+    """
+    Start a new undetected Chrome instance.
+
+    Without a user_data_dir, every instance gets its own temporary
+    profile, so several browsers can run side by side.
+
+    Args:
+        headless: Run browser in headless mode
+        user_data_dir: Chrome profile directory to use, or None for a
+            fresh temporary profile
+    """
+    # Imported here, as undetected_chromedriver and selenium take a
+    # noticeable time to load and are only needed once a browser starts
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+    if headless:
+        # Use old headless mode as new one has issues
+        options.add_argument('--headless')
+        options.add_argument('--disable-gpu')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--no-sandbox')
+    # Return from driver.get() once the DOM is ready instead of waiting for
+    # every image and stylesheet; callers wait for the elements they need
+    options.page_load_strategy = 'eager'
+    if user_data_dir:
+        options.add_argument('--profile-directory=Default')
+
+    # Use version 144 to match current Chrome
+    with _CREATE_LOCK:
+        return uc.Chrome(
+            options=options,
+            user_data_dir=str(user_data_dir) if user_data_dir else None,
+            version_main=144
+        )
+
+
+def quit_driver(driver):
+    """Quit a browser, ignoring errors from one that is already gone."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+@contextmanager
+def acquire_driver(headless=False):
+    """
+    Borrow a browser from the pool, starting a new one if none is idle.
+
+    The browser is reset to a blank page and returned to the pool
+    afterwards, so repeated uses in one process skip the Chrome startup.
+    A browser is discarded instead if the block raised.
+
+    Args:
+        headless: Run browser in headless mode
+    """
+    pool = _DRIVER_POOLS[bool(headless)]
+    try:
+        driver = pool.get_nowait()
+    except queue.Empty:
+        driver = create_driver(headless)
+
+    try:
+        yield driver
+    except BaseException:
+        quit_driver(driver)
+        raise
+
+    try:
+        driver.get('about:blank')
+    except Exception:
+        quit_driver(driver)
+    else:
+        pool.put(driver)
+
+
+@atexit.register
+def _quit_pooled_drivers():
+    """Quit all idle browsers when the process exits."""
+    for pool in _DRIVER_POOLS.values():
+        while True:
+            try:
+                driver = pool.get_nowait()
+            except queue.Empty:
+                break
+            quit_driver(driver)
@@ -6,16 +6,139 @@ brew install tesseract tesseract-lang
 
 '''
 
+import hashlib
+import io
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Resolution pages are rasterised at for OCR. Lower values are faster,
+# but Tesseract loses accuracy on small print below about 200
+DEFAULT_DPI = 200
+
+# Least number of pages rasterised per call to Poppler. Each call starts
+# pdftoppm and parses the pdf again, so pages are not rendered one by one
+RASTER_BATCH = 4
+
+# Non-whitespace characters a page's text layer needs before its OCR is
+# skipped. Scanned pages often carry a few stray characters
+MIN_PAGE_TEXT_CHARS = 50
+
+# Directory where OCR results can be cached by pdf content, since the same
+# document is often published under several names. Used by the superocr
+# command line; library callers opt in by passing a cache directory
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'epscraper'
+
+# Per-thread tesserocr API instances, keyed by language
+_thread_state = threading.local()
+
 
 def _get_logger(x):
-    import logging
     return logging.getLogger(__name__ + '.' + x.__name__)
 
 
-def get_text_from_pdf(pdf_path,language):
+def _import_tesserocr():
+    '''
+    Returns the tesserocr module, or None if it is not installed.
+    '''
+    try:
+        import tesserocr
+    except ImportError:
+        return None
+    return tesserocr
+
+
+def _tesserocr_api(tesserocr, language):
+    '''
+    Returns the calling thread's tesserocr API for the given language,
+    creating it on first use. The API keeps the language model loaded,
+    so it is reused for all pages and pdfs the thread converts.
+    '''
+    apis = _thread_state.__dict__.setdefault('apis', {})
+    if language not in apis:
+        apis[language] = tesserocr.PyTessBaseAPI(lang=language)
+    return apis[language]
+
+
+def get_text_layer(pdf_path):
+    '''
+    Extracts the embedded text layer of a pdf with pdftotext, which
+    comes with poppler, like the pdf2image backend. This takes
+    milliseconds, where OCR takes seconds per page, but gives nothing
+    for scanned documents.
+    pdf_path - the file path to the PDF to analyse.
+    Returns the text, or an empty string if the pdf has no text layer
+    or pdftotext is not available.
+    '''
+    log = _get_logger(get_text_layer)
+    try:
+        result = subprocess.run(['pdftotext', '-enc', 'UTF-8', str(pdf_path), '-'],
+                                capture_output=True)
+    except OSError as e:
+        log.debug('Could not run pdftotext: %s', e)
+        return ''
+    if result.returncode != 0:
+        log.debug('pdftotext failed for "%s": %s', pdf_path, result.stderr.decode(errors='replace'))
+        return ''
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+def _cache_file(cache_dir, pdf_path, *settings):
+    '''
+    Returns the path of the cache file for the OCR result of a pdf,
+    named after the SHA-256 of its content and the OCR settings.
+    '''
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return Path(cache_dir) / '.'.join([digest.hexdigest(), *map(str, settings), 'txt'])
+
+
+def _write_cache(cache_file, text):
+    '''
+    Stores an OCR result in the cache, atomically. Errors are logged
+    and otherwise ignored, as the cache is only an optimisation.
+    '''
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        part_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.part')
+        part_file.write_bytes(text.encode('utf-8'))
+        os.replace(part_file, cache_file)
+    except OSError as e:
+        _get_logger(_write_cache).debug('Could not cache OCR result: %s', e)
+
+
+def _page_batches(pages, size):
+    '''
+    Groups page numbers, in increasing order, into runs of consecutive
+    pages of at most size pages, which Poppler can render in one call.
+    Returns a list of [first_page, last_page] pairs.
+    '''
+    batches = []
+    for page in pages:
+        if batches and page == batches[-1][1] + 1 and page - batches[-1][0] < size:
+            batches[-1][1] = page
+        else:
+            batches.append([page, page])
+    return batches
+
+
+def get_text_from_pdf(pdf_path,language,workers=1,dpi=DEFAULT_DPI,cache_dir=None,
+                      min_page_chars=MIN_PAGE_TEXT_CHARS):
     '''
     Converts a (non-extractable) pdf to text via optical
     image to text transformation. Also supports scanned documents.
+    Pages with an embedded text layer are taken from that instead, so
+    in pdfs mixing text and scanned pages only the scans are OCR'd.
+    Uses the tesserocr bindings to run Tesseract in-process when they
+    are installed, and the tesseract command through pytesseract
+    otherwise.
     pdf_path - the file path to the PDF to analyse.
     language - The language in the pdf to extract from.
                Use, for example, one of
@@ -25,25 +148,155 @@ def get_text_from_pdf(pdf_path,language):
 
                For more languages, check out
                https://tesseract-ocr.github.io/tessdoc/Data-Files-in-different-versions.html
+    workers  - The number of pages to rasterise and OCR in parallel.
+               Tesseract runs in a separate process, or releases the
+               GIL under tesserocr, so threads are enough to use
+               several cores. Keep the default of 1 when PDFs are
+               already converted in parallel, as superocr does.
+    dpi      - The resolution to rasterise the pages at.
+    cache_dir - Directory where results are cached by the content of
+               the pdf, e.g. CACHE_DIR, or None (the default) to
+               disable the cache.
+    min_page_chars - The number of non-whitespace characters a page's
+               text layer needs to be used instead of OCR, or None to
+               OCR every page.
 
     '''
     import pytesseract
     import pdf2image
+    tesserocr = _import_tesserocr()
 
     log = _get_logger(get_text_from_pdf)
-    log.info('Converting the file "%s" to text.', pdf_path)
 
-    # Convert pdf to a sequence of jpeg images
-    pdfImgs=pdf2image.convert_from_path(pdf_path)
+    # pdftotext ends every page with a form feed
+    page_texts = get_text_layer(pdf_path).split('\f')[:-1] if min_page_chars is not None else []
+    ocr_pages = [page for page, text in enumerate(page_texts, 1)
+                 if len(''.join(text.split())) < min_page_chars]
+    if page_texts and not ocr_pages:
+        log.debug('Using the text layer of "%s".', pdf_path)
+        return ' '.join(page_texts)
+
+    # Which pages were OCR'd depends on the text layer threshold, and the
+    # text on the OCR backend, so both are part of the cache key
+    text_layer = 'ocr' if min_page_chars is None else min_page_chars
+    backend = 'tesserocr' if tesserocr else 'pytesseract'
+    cache_file = (_cache_file(cache_dir, pdf_path, language, dpi, text_layer, backend)
+                  if cache_dir else None)
+    if cache_file and cache_file.is_file():
+        log.debug('Using the cached text of "%s".', pdf_path)
+        return cache_file.read_bytes().decode('utf-8')
+
+    if not page_texts:
+        # No text layer, or it is not to be used
+        num_pages = pdf2image.pdfinfo_from_path(pdf_path)['Pages']
+        page_texts = [''] * num_pages
+        ocr_pages = list(range(1, num_pages + 1))
+
+    log.debug('Converting the file "%s" to text (OCR of %d of %d pages).',
+             pdf_path, len(ocr_pages), len(page_texts))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Convert the pages to OCR to a sequence of image files, a batch
+        # of pages at a time in a background thread, so Tesseract starts
+        # on the first pages while Poppler renders the rest. Tesseract
+        # reads the files itself, so the pages are never all held in
+        # memory at once.
+        # Tesseract works on grayscale anyway, and a single channel is a
+        # third of the pixel data to write and read back
+        batches = _page_batches(ocr_pages, max(workers, RASTER_BATCH))
+        page_queue = queue.Queue()
+        stop = threading.Event()
+
+        def rasterise():
+            try:
+                for first_page, last_page in batches:
+                    if stop.is_set():
+                        break
+                    for page_file in pdf2image.convert_from_path(
+                            pdf_path,dpi=dpi,grayscale=True,
+                            first_page=first_page,last_page=last_page,
+                            thread_count=workers,
+                            output_folder=tmp_dir,paths_only=True):
+                        page_queue.put(page_file)
+            except Exception as e:
+                page_queue.put(e)
+            finally:
+                page_queue.put(None)
 
-    # Extract the text from each image
-    extracted_text=[]
-    for im in pdfImgs:
-        text=pytesseract.image_to_string(im,lang=language)
-        extracted_text.append(text)
+        # The image files in page order, as they are rendered
+        def page_files():
+            for item in iter(page_queue.get, None):
+                if isinstance(item, Exception):
+                    raise item
+                yield item
 
-    # Join into one long string
-    result = ' '.join(extracted_text)
+        rasteriser = threading.Thread(target=rasterise, daemon=True)
+        rasteriser.start()
+
+        # Extract the text from each image, keeping the page order
+        def ocr_page(page_file):
+            if tesserocr:
+                api = _tesserocr_api(tesserocr, language)
+                api.SetImageFile(page_file)
+                return api.GetUTF8Text()
+            return pytesseract.image_to_string(page_file,lang=language)
+
+        # Write each page into one buffer as it is done, separated by
+        # spaces, so the page texts are not all kept until the end.
+        # OCR results replace the text layer of the pages they are for
+        buffer = io.StringIO()
+
+        def write_pages(ocr_texts):
+            ocr_texts = iter(ocr_texts)
+            ocr_set = set(ocr_pages)
+            for page, text in enumerate(page_texts, 1):
+                if page > 1:
+                    buffer.write(' ')
+                buffer.write(next(ocr_texts) if page in ocr_set else text)
+
+        try:
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    write_pages(executor.map(ocr_page,page_files()))
+            else:
+                write_pages(ocr_page(page_file) for page_file in page_files())
+        finally:
+            # Let Poppler finish before the temporary directory is removed
+            stop.set()
+            rasteriser.join()
+
+    result = buffer.getvalue()
     log.debug('Extracted text:\n%s', result)
 
+    if cache_file:
+        _write_cache(cache_file, result)
+
     return result
+
+
+def warm_up(language):
+    '''
+    Prepares the calling process for get_text_from_pdf, by importing
+    the OCR modules and running Tesseract once on a small blank image.
+    This loads the language data for the given language into the
+    file system cache before the first real page is processed, and
+    with tesserocr keeps it loaded in the calling thread.
+    Errors are logged and otherwise ignored; they will surface again
+    when a real PDF is converted.
+    language - The language to load, as for get_text_from_pdf.
+    '''
+    log = _get_logger(warm_up)
+    try:
+        import pytesseract
+        import pdf2image
+        from PIL import Image
+
+        tesserocr = _import_tesserocr()
+        if tesserocr:
+            api = _tesserocr_api(tesserocr, language)
+            api.SetImage(Image.new('L', (32, 32), 255))
+            api.GetUTF8Text()
+        else:
+            pytesseract.image_to_string(Image.new('L', (32, 32), 255), lang=language)
+    except Exception as e:
+        log.debug('Tesseract warm-up failed: %s', e)
@@ -13,12 +13,14 @@ Usage:
 
 import sys
 import os
+import logging
 
-from epscraper.supersearcher import search_pdfs
-from epscraper.superdownloader import download_pdfs
+from epscraper.supersearcher import MAX_PAGES, search_pdfs
+from epscraper.superdownloader import download_pdfs_from_list, DEFAULT_WORKERS
 
 
-def search_and_download(search_string, output_dir='./pdfs', url_file=None, headless=False, start_page=1, end_page=None):
+def search_and_download(search_string, output_dir='./pdfs', url_file=None, headless=False, start_page=1, end_page=None,
+                        workers=DEFAULT_WORKERS, max_pages=MAX_PAGES):
     """
     Search for PDFs and download them.
 
@@ -28,7 +30,11 @@ def search_and_download(search_string, output_dir='./pdfs', url_file=None, headl
         url_file: Optional custom path for URL file. If None, uses default naming
         headless: Run browsers in headless mode (default: False)
         start_page: First page to extract from (default: 1)
-        end_page: Last page to extract from (default: None, meaning all pages)
+        end_page: Last page to extract from (default: None, meaning all
+            pages, up to max_pages pages)
+        workers: Number of PDFs downloaded concurrently (default: 8)
+        max_pages: Most pages to extract from when no end page is given
+            (default: 50, None for no limit)
 
     Returns:
         tuple: (number of URLs found, number of PDFs downloaded)
@@ -39,25 +45,21 @@ def search_and_download(search_string, output_dir='./pdfs', url_file=None, headl
 
     # Search and extract URLs
     urls = search_pdfs(search_string, output_file=url_file, headless=headless, 
-                      start_page=start_page, end_page=end_page)
+                      start_page=start_page, end_page=end_page, max_pages=max_pages)
 
     if not urls:
         print('\nNo URLs found. Nothing to download.')
         return (0, 0)
 
-    # Determine the URL file path
-    if url_file is None:
-        safe_search_string = search_string.replace(' ', '_')
-        url_file = f'data/{safe_search_string}_urls.txt'
-
     print('\n' + '=' * 70)
     print('STEP 2: DOWNLOADING PDFs')
     print('=' * 70)
-    print(f'\nDownloading {len(urls)} PDFs to {output_dir}/')
-    print(f'Reading from: {url_file}\n')
+    print(f'\nDownloading {len(urls)} PDFs to {output_dir}/\n')
 
-    # Download PDFs
-    downloaded_count = download_pdfs(url_file, output_dir=output_dir, headless=headless)
+    # Download PDFs straight from the search results, reusing the search
+    # browser, which has already passed the age verification
+    downloaded_count = download_pdfs_from_list(urls, output_dir=output_dir, headless=headless, workers=workers,
+                                               profile_dir=None)
 
     print('\n' + '=' * 70)
     print('WORKFLOW COMPLETE')
@@ -70,77 +72,82 @@ def search_and_download(search_string, output_dir='./pdfs', url_file=None, headl
 
 
 def main():
-    if len(sys.argv) < 2 or sys.argv[1] in ['--help', '-h', 'help']:
-        print('Usage: python search_and_download.py <search_string> --pages <START END|all> [OPTIONS]')
-        print('\nRequired:')
-        print('  --pages START END  Extract pages START to END (inclusive)')
-        print('  --pages all        Extract all pages')
-        print('\nOptions:')
-        print('  --output-dir DIR   Directory to save PDFs (default: ./pdfs)')
-        print('  --url-file FILE    Custom path for URL file (default: data/<search>_urls.txt)')
-        print('  --headless         Run browsers in headless mode (experimental)')
-        print('\nExamples:')
-        print('  python search_and_download.py "flight logs" --pages all')
-        print('  python search_and_download.py "email" --pages 10 20')
-        print('  python search_and_download.py "black book" --pages all --output-dir pdfs/blackbook')
-        sys.exit(0 if len(sys.argv) > 1 else 1)
-
-    # Parse arguments
-    search_string = sys.argv[1]
-    output_dir = './pdfs'
-    url_file = None
-    headless = '--headless' in sys.argv
-    start_page = 1
-    end_page = None
-
-    # Check for output directory option
-    if '--output-dir' in sys.argv:
-        try:
-            idx = sys.argv.index('--output-dir')
-            output_dir = sys.argv[idx + 1]
-        except (ValueError, IndexError):
-            print('Error: --output-dir requires a directory path')
-            sys.exit(1)
-
-    # Check for URL file option
-    if '--url-file' in sys.argv:
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', force=True)
+
+    parser = argparse.ArgumentParser(
+        description='Search justice.gov/epstein for PDFs and download them',
+        epilog='Examples:\n'
+               '  python search_and_download.py "flight logs" --pages all\n'
+               '  python search_and_download.py "email" --pages 10 20\n'
+               '  python search_and_download.py "black book" --pages all --output-dir pdfs/blackbook',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        'search_string',
+        help='The search query'
+    )
+    parser.add_argument(
+        '--pages',
+        nargs='+',
+        required=True,
+        metavar='PAGE',
+        help='Extract pages START END (inclusive), or "all" for all pages, up to --max-pages'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=MAX_PAGES,
+        metavar='N',
+        help=f'Most pages to extract from with "all", 0 for no limit (default: {MAX_PAGES})'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='./pdfs',
+        help='Directory to save PDFs (default: ./pdfs)'
+    )
+    parser.add_argument(
+        '--url-file',
+        help='Custom path for URL file (default: data/<search>_urls.txt)'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Run browsers in headless mode (experimental)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of concurrent downloads (default: {DEFAULT_WORKERS})'
+    )
+
+    args = parser.parse_args()
+
+    # Normalize the page range
+    if len(args.pages) == 1 and args.pages[0].lower() == 'all':
+        start_page, end_page = 1, None
+    else:
         try:
-            idx = sys.argv.index('--url-file')
-            url_file = sys.argv[idx + 1]
-        except (ValueError, IndexError):
-            print('Error: --url-file requires a file path')
-            sys.exit(1)
-
-    # Check for page range (REQUIRED)
-    if '--pages' not in sys.argv:
-        print('Error: --pages is required. Use "--pages all" or "--pages START END"')
-        sys.exit(1)
-    
-    try:
-        pages_index = sys.argv.index('--pages')
-        pages_arg = sys.argv[pages_index + 1]
-        
-        if pages_arg.lower() == 'all':
-            start_page = 1
-            end_page = None
-        else:
-            start_page = int(pages_arg)
-            end_page = int(sys.argv[pages_index + 2])
-            if start_page < 1 or end_page < start_page:
-                print('Error: Invalid page range. START must be >= 1 and END must be >= START')
-                sys.exit(1)
-    except (ValueError, IndexError):
-        print('Error: --pages requires either "all" or two integers (START END)')
-        sys.exit(1)
+            start_page, end_page = map(int, args.pages)
+        except ValueError:
+            parser.error('--pages requires either "all" or two integers (START END)')
+        if start_page < 1 or end_page < start_page:
+            parser.error('Invalid page range. START must be >= 1 and END must be >= START')
+    if args.max_pages < 0:
+        parser.error('--max-pages must be >= 0')
 
     try:
         urls_found, pdfs_downloaded = search_and_download(
-            search_string,
-            output_dir=output_dir,
-            url_file=url_file,
-            headless=headless,
+            args.search_string,
+            output_dir=args.output_dir,
+            url_file=args.url_file,
+            headless=args.headless,
             start_page=start_page,
-            end_page=end_page
+            end_page=end_page,
+            workers=args.workers,
+            max_pages=args.max_pages or None
         )
         sys.exit(0 if pdfs_downloaded > 0 else 1)
     except Exception as e:
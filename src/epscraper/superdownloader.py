@@ -11,6 +11,9 @@ detection and maintains session cookies across multiple downloads.
 Public API:
     download_pdfs(url_files, output_dir="./pdfs", headless=False)
         Main function to download PDFs from one or more URL files.
+
+    download_pdfs_from_list(urls, output_dir="./pdfs", headless=False)
+        Download PDFs from an in-memory list of URLs.
     
     PDFDownloader(output_dir="./pdfs", headless=False)
         Context manager class for advanced usage.
@@ -26,186 +29,451 @@ Command-line usage:
 
 import os
 import sys
+import json
 import time
-import ssl
+import logging
+import tempfile
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse, unquote
 from pathlib import Path
 
-# Workaround for SSL certificate issues on macOS
-ssl._create_default_https_context = ssl._create_unverified_context
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from epscraper.browser import acquire_driver, create_driver
+
+
+__all__ = ['download_pdfs', 'download_pdfs_from_list', 'PDFDownloader']
+
+logger = logging.getLogger(__name__)
+
+# Default number of PDFs fetched concurrently once age verification has passed
+DEFAULT_WORKERS = 8
+
+# Default maximum number of PDF requests per second sent to the server
+DEFAULT_RATE = 5.0
+
+# Chrome profile kept between runs, so the age gate and CAPTCHA are not
+# solved again every time the downloader starts
+PROFILE_DIR = Path.home() / ".epscraper-chrome"
+
+# Name of the file in the profile directory holding the verified cookies.
+# Chrome drops session cookies on exit, so they are saved separately
+COOKIE_FILE = "cookies.json"
+
+def _write_all(fd, data):
+    """Write all of data to the file descriptor and return the number of bytes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    return len(data)
+
+
+def _age_button_or_pdf(driver):
+    """
+    Wait condition for the age verification.
+
+    Returns the 'Yes' button once the age verification page is shown,
+    True once the browser displays the PDF itself, and False otherwise.
+    """
+    from selenium.webdriver.common.by import By
+
+    buttons = driver.find_elements(By.ID, "age-button-yes")
+    if buttons:
+        return buttons[0]
+    return driver.execute_script("return document.contentType") == "application/pdf"
+
 
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+@lru_cache(maxsize=4096)
+def _filename_from_url(url):
+    """Return the decoded last path segment of a URL, or '' if there is none."""
+    if '://' in url:
+        # Plain string splitting is enough for the http(s) URLs used here,
+        # and much cheaper than urlparse
+        path = url.partition('#')[0].partition('?')[0].partition('://')[2].partition('/')[2]
+    else:
+        path = urlparse(url).path
+    # Decode URL encoding (e.g., %20 -> space)
+    return unquote(path.rpartition('/')[2])
+
+
+def _load_urls(url_files, verbose=False):
+    """
+    Read the URLs from one or more URL files.
+
+    Blank lines and lines starting with '#' are skipped. Duplicates are
+    kept here and reported by PDFDownloader.download_urls.
+
+    Args:
+        url_files: Paths of the files to read
+        verbose: Print the name of each file as it is read
+
+    Returns:
+        List of URLs, in file order
+    """
+    urls = []
+    for url_file in url_files:
+        if verbose:
+            logger.info(f"Reading URLs from: {url_file}")
+        lines = Path(url_file).read_text().splitlines()
+        urls.extend(line for line in map(str.strip, lines) if line and not line.startswith('#'))
+    return urls
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of outgoing requests.
+
+    Requests only wait when they would exceed the rate, so slow responses
+    do not add extra delay on top of the time already spent waiting.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        Initialize the bucket.
 
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens that can be saved up
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
 
-__all__ = ['download_pdfs', 'PDFDownloader']
+    def acquire(self):
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve the token now, so that concurrent callers queue up
+            # behind each other instead of all waking at the same time
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
 
 
 class PDFDownloader:
-    def __init__(self, output_dir="./pdfs", headless=False):
+    # Bytes read from the network per write to disk
+    CHUNK_SIZE = 1 << 18
+
+    # Seconds to wait for each step of the age verification
+    VERIFY_TIMEOUT = 10
+
+    # Separate connect and read timeouts for PDF requests, in seconds. The
+    # read timeout applies to each chunk, so large PDFs are not cut short
+    TIMEOUT = (5, 60)
+
+    def __init__(self, output_dir="./pdfs", headless=False, chunk_size=None, workers=DEFAULT_WORKERS,
+                 rate=DEFAULT_RATE, profile_dir=PROFILE_DIR):
         """
         Initialize PDF downloader.
         
         Args:
             output_dir: Directory to save downloaded PDFs
             headless: Run browser in headless mode (currently not supported due to Chrome limitations)
+            chunk_size: Download chunk size in bytes (default: CHUNK_SIZE)
+            workers: Number of concurrent downloads (default: DEFAULT_WORKERS)
+            rate: Maximum PDF requests per second, or None for no limit (default: DEFAULT_RATE)
+            profile_dir: Chrome profile directory kept between runs, or None to
+                borrow a browser from the shared pool (default: PROFILE_DIR)
         """
         self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate) if rate else None
         self.output_dir.mkdir(exist_ok=True)
         self.headless = headless
+        self.profile_dir = Path(profile_dir) if profile_dir else None
         self.driver = None
+        self.session = None
+        self._driver_context = None
+        self._age_verified = False
+        # Only cookies from a verification in this browser are worth saving;
+        # saved cookies that still work are already on disk
+        self._browser_verified = False
+        self._try_saved_cookies = False
         
     def __enter__(self):
         """Context manager entry."""
-        options = uc.ChromeOptions()
-        if self.headless:
-            # Use old headless mode as new one has issues
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--no-sandbox')
-        
-        # Use version 144 to match current Chrome
-        self.driver = uc.Chrome(options=options, version_main=144)
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            self.driver = create_driver(self.headless, self.profile_dir)
+        else:
+            # Borrow a warm browser, which may already have passed the age
+            # verification during a search in this process
+            self._driver_context = acquire_driver(self.headless)
+            self.driver = self._driver_context.__enter__()
+
+        # Pool one keep-alive connection per download worker and retry
+        # transient server errors with exponential backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=self.workers,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._try_saved_cookies = self.load_cookies()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - cleanup resources."""
         if self.driver:
-            self.driver.quit()
+            if self._browser_verified:
+                self.save_cookies()
+            if self._driver_context:
+                self._driver_context.__exit__(exc_type, exc_val, exc_tb)
+                self._driver_context = None
+            else:
+                self.driver.quit()
+            self.driver = None
+        if self.session:
+            self.session.close()
         
+    def set_session_cookies(self, cookies):
+        """Copy cookies, as returned by Selenium, to the HTTP session."""
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'])
+
+    def load_cookies(self):
+        """
+        Load the cookies saved by an earlier run into the HTTP session.
+
+        Returns:
+            True if any cookies were loaded
+        """
+        if not self.profile_dir:
+            return False
+        try:
+            with open(self.profile_dir / COOKIE_FILE, 'r') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.set_session_cookies(cookies)
+        return bool(cookies)
+
+    def save_cookies(self):
+        """Save the browser cookies, so the next run can reuse them."""
+        if not self.profile_dir:
+            return
+        try:
+            cookies = self.driver.get_cookies()
+            if not cookies:
+                # Keep the cookies of an earlier run rather than erase them
+                return
+            with open(self.profile_dir / COOKIE_FILE, 'w') as f:
+                json.dump(cookies, f)
+        except Exception as e:
+            logger.warning(f"Could not save cookies: {e}")
+
     def extract_filename(self, url):
         """Extract the PDF filename from the URL."""
-        parsed = urlparse(url)
-        filename = parsed.path.split('/')[-1]
-        # Decode URL encoding (e.g., %20 -> space)
-        filename = unquote(filename)
-        return filename
+        return _filename_from_url(url)
     
+    def verify_age(self, url):
+        """
+        Pass the age verification in the browser and hand the resulting
+        cookies over to the HTTP session used for the actual downloads.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        # Navigate to the URL
+        self.driver.get(url)
+
+        # Wait until either the age verification page or the PDF is shown
+        try:
+            page = WebDriverWait(self.driver, self.VERIFY_TIMEOUT).until(_age_button_or_pdf)
+        except TimeoutException:
+            page = None
+
+        if page is None or page is True:
+            logger.info(f"  No age verification required (or button not found)")
+        else:
+            try:
+                logger.info(f"  Age verification required, clicking 'Yes' button...")
+                page.click()
+
+                # Wait for the page to process the click and set cookies
+                WebDriverWait(self.driver, self.VERIFY_TIMEOUT).until(EC.invisibility_of_element(page))
+
+                # Navigate to the PDF again
+                logger.info(f"  Accessing PDF...")
+                self.driver.get(url)
+
+            except Exception as e:
+                logger.warning(f"  Age verification failed: {e}")
+
+        # Copy cookies from Selenium to the shared session
+        self.set_session_cookies(self.driver.get_cookies())
+
+    def fetch_pdf(self, url, output_path):
+        """Fetch a single PDF using the session cookies, streaming it to disk."""
+        if self.bucket:
+            self.bucket.acquire()
+        with self.session.get(url, stream=True, timeout=self.TIMEOUT) as response:
+            chunks = response.iter_content(chunk_size=self.chunk_size)
+            first_chunk = next(chunks, b'')
+
+            if response.status_code != 200 or not first_chunk.startswith(b'%PDF'):
+                logger.warning(f"  ✗ Error: {url} is not a valid PDF (status: {response.status_code})")
+                return False
+
+            expected_size = int(response.headers.get('Content-Length') or 0)
+            size = 0
+            # Write to a partial file of this download's own, so an
+            # interrupted download is not mistaken for a finished one by the
+            # already-exists check, and concurrent downloads never share one
+            fd, part_path = tempfile.mkstemp(prefix=output_path.name + '.', suffix='.part',
+                                             dir=output_path.parent)
+            try:
+                if hasattr(os, 'fchmod'):
+                    # mkstemp makes the file readable by the owner only
+                    os.fchmod(fd, 0o644)
+                # Reserve the space up front so the file is laid out contiguously
+                if expected_size and hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(fd, 0, expected_size)
+                    except OSError:
+                        pass
+                # The chunks are already large, so write them straight to
+                # the file descriptor without a Python file buffer
+                size += _write_all(fd, first_chunk)
+                for chunk in chunks:
+                    size += _write_all(fd, chunk)
+                if size < expected_size:
+                    os.ftruncate(fd, size)
+            except BaseException:
+                os.close(fd)
+                os.remove(part_path)
+                raise
+            os.close(fd)
+            os.replace(part_path, output_path)
+
+        logger.info(f"  ✓ Downloaded {output_path.name} ({size} bytes)")
+        return True
+
     def download_pdf(self, url):
         """Download a single PDF, handling age verification."""
         filename = self.extract_filename(url)
+        if not filename:
+            logger.warning(f"  ✗ Error: {url} does not name a file")
+            return False
         output_path = self.output_dir / filename
         
         # Check if file already exists
         if output_path.exists():
-            print(f"Skipping (already exists): {url}")
-            print(f"  -> {output_path}")
+            logger.info(f"Skipping (already exists): {url}\n  -> {output_path}")
             return True
         
-        print(f"Downloading: {url}")
-        print(f"  -> {output_path}")
+        logger.info(f"Downloading: {url}\n  -> {output_path}")
         
         try:
-            # Navigate to the URL
-            self.driver.get(url)
-            time.sleep(0.1)  # Wait for page to load
-            
-            # Check if we're on the age verification page by looking for the button
-            try:
-                yes_button = WebDriverWait(self.driver, 1).until(
-                    EC.presence_of_element_located((By.ID, "age-button-yes"))
-                )
-                print(f"  Age verification required, clicking 'Yes' button...")
-                yes_button.click()
-                
-                # Wait for the page to process the click and set cookies
-                time.sleep(0.1)
-                
-                # Navigate to the PDF again
-                print(f"  Accessing PDF...")
-                self.driver.get(url)
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"  No age verification required (or button not found)")
-            
-            # Get the page source to check if it's PDF or HTML
-            page_source = self.driver.page_source
-            
-            # If we still have HTML, try getting the content via requests with the cookies
-            if '<html' in page_source.lower():
-                print(f"  Getting PDF with session cookies...")
-                import requests
-                
-                # Get cookies from Selenium
-                cookies = self.driver.get_cookies()
-                session = requests.Session()
-                for cookie in cookies:
-                    session.cookies.set(cookie['name'], cookie['value'])
-                
-                # Download the PDF
-                response = session.get(url)
-                
-                if response.status_code == 200 and response.content.startswith(b'%PDF'):
-                    with open(output_path, 'wb') as f:
-                        f.write(response.content)
-                    print(f"  ✓ Downloaded successfully ({len(response.content)} bytes)")
-                    return True
-                else:
-                    print(f"  ✗ Error: Not a valid PDF (status: {response.status_code}, size: {len(response.content)})")
-                    return False
-            else:
-                # We might have gotten the PDF directly in the page_source (unlikely)
-                print(f"  ✗ Error: Unexpected content type")
-                return False
+            if not self._age_verified:
+                if self._try_saved_cookies:
+                    # Cookies from an earlier run may still give access
+                    self._try_saved_cookies = False
+                    logger.info(f"  Trying cookies saved by the previous run...")
+                    if self.fetch_pdf(url, output_path):
+                        self._age_verified = True
+                        return True
+                self.verify_age(url)
+                # The cookies are good once they have fetched a real PDF
+                self._age_verified = self.fetch_pdf(url, output_path)
+                self._browser_verified = self._age_verified
+                return self._age_verified
+            return self.fetch_pdf(url, output_path)
                 
         except Exception as e:
-            print(f"  ✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"  ✗ Error: {e}")
             return False
     
-    def download_from_file(self, url_file):
-        """Download all PDFs from a file containing URLs (one per line)."""
-        urls = []
-        with open(url_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    urls.append(line)
-        
-        print(f"Found {len(urls)} URLs to download\n")
-        
-        success_count = 0
-        for i, url in enumerate(urls, 1):
-            print(f"[{i}/{len(urls)}]")
-            if self.download_pdf(url):
+    def existing_files(self):
+        """Return the names of the files already in the output directory."""
+        with os.scandir(self.output_dir) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+
+    def download_urls(self, urls):
+        """
+        Download all PDFs in a list of URLs.
+
+        Duplicate URLs and PDFs already in the output directory are
+        skipped up front. The browser is only used until the first PDF
+        has been fetched with the session cookies; the remaining PDFs are
+        then downloaded concurrently over the HTTP session.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) < len(urls):
+            logger.info(f"Ignoring {len(urls) - len(unique_urls)} duplicate URLs")
+
+        # URLs differing only in their query or fragment are saved under the
+        # same file name; download each file once
+        by_filename = {}
+        unnamed = 0
+        for url in unique_urls:
+            filename = self.extract_filename(url)
+            if not filename:
+                # It would be saved as the output directory itself
+                logger.warning(f"  ✗ Error: {url} does not name a file")
+                unnamed += 1
+                continue
+            by_filename.setdefault(filename, url)
+        if len(by_filename) + unnamed < len(unique_urls):
+            logger.info(f"Ignoring {len(unique_urls) - unnamed - len(by_filename)} URLs of files already listed")
+        urls = list(by_filename.values())
+
+        # One directory read instead of a stat() per URL
+        existing = self.existing_files()
+        pending = [url for name, url in by_filename.items() if name not in existing]
+        skipped = len(urls) - len(pending)
+        if skipped:
+            logger.info(f"Skipping {skipped} PDFs already in {self.output_dir}")
+
+        success_count = skipped
+        done = 0
+
+        # Pass age verification (and the CAPTCHA) one URL at a time until
+        # the session cookies are known to give access to the PDFs
+        while done < len(pending) and not self._age_verified:
+            logger.info(f"[{done + 1}/{len(pending)}]")
+            if self.download_pdf(pending[done]):
                 success_count += 1
-            print()
-        
-        print(f"Complete: {success_count}/{len(urls)} downloaded successfully")
+            done += 1
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.download_pdf, url) for url in pending[done:]]
+            for i, future in enumerate(as_completed(futures), done + 1):
+                if future.result():
+                    success_count += 1
+                logger.info(f"[{i}/{len(pending)}] done")
+
+        logger.info(f"Complete: {success_count}/{len(urls) + unnamed} downloaded successfully")
         return success_count
+
+    def download_from_file(self, url_file):
+        """Download all PDFs from a file containing URLs (one per line)."""
+        urls = _load_urls([url_file])
+        logger.info(f"Found {len(urls)} URLs to download")
+        return self.download_urls(urls)
     
     def download_from_multiple_files(self, url_files):
         """Download all PDFs from multiple files, reusing browser session."""
-        all_urls = []
-        
-        # Collect all URLs from all files
-        for url_file in url_files:
-            print(f"Reading URLs from: {url_file}")
-            with open(url_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        all_urls.append(line)
-        
-        print(f"\nFound {len(all_urls)} total URLs to download\n")
-        
-        success_count = 0
-        for i, url in enumerate(all_urls, 1):
-            print(f"[{i}/{len(all_urls)}]")
-            if self.download_pdf(url):
-                success_count += 1
-            print()
-        
-        print(f"Complete: {success_count}/{len(all_urls)} downloaded successfully")
-        return success_count
+        all_urls = _load_urls(url_files, verbose=True)
+        logger.info(f"Found {len(all_urls)} total URLs to download")
+        return self.download_urls(all_urls)
 
 
-def download_pdfs(url_files, output_dir="./pdfs", headless=False):
+def download_pdfs(url_files, output_dir="./pdfs", headless=False, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                  profile_dir=PROFILE_DIR):
     """
     Download PDFs from one or more URL files.
     
@@ -213,6 +481,10 @@ def download_pdfs(url_files, output_dir="./pdfs", headless=False):
         url_files: String path to a single file, or list of file paths
         output_dir: Directory to save downloaded PDFs (default: "./pdfs")
         headless: Run browser in headless mode (default: False, experimental)
+        workers: Number of concurrent downloads (default: 8)
+        rate: Maximum PDF requests per second, or None for no limit (default: 5.0)
+        profile_dir: Chrome profile directory kept between runs, or None to borrow
+            a browser from the shared pool (default: ~/.epscraper-chrome)
     
     Returns:
         int: Number of successfully downloaded PDFs
@@ -233,42 +505,86 @@ def download_pdfs(url_files, output_dir="./pdfs", headless=False):
             raise FileNotFoundError(f"URL file not found: {url_file}")
     
     # Download using context manager
-    with PDFDownloader(output_dir=output_dir, headless=headless) as downloader:
+    with PDFDownloader(output_dir=output_dir, headless=headless, workers=workers, rate=rate,
+                       profile_dir=profile_dir) as downloader:
         if len(url_files) == 1:
             return downloader.download_from_file(url_files[0])
         else:
             return downloader.download_from_multiple_files(url_files)
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python superdownloader.py <url_file> [url_file2 ...] [--headless]")
-        print("  url_file: Text file(s) containing URLs, one per line")
-        print("  --headless: Optional flag to run in headless mode (experimental, may not work)")
-        print("\nExamples:")
-        print("  python superdownloader.py urls.txt")
-        print("  python superdownloader.py urls1.txt urls2.txt urls3.txt")
-        print("\nNote: By default, the browser runs in visible mode due to Chrome/Selenium limitations.")
-        print("When processing multiple files, you only need to pass the CAPTCHA once at the start.")
-        sys.exit(1)
+def download_pdfs_from_list(urls, output_dir="./pdfs", headless=False, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                            profile_dir=PROFILE_DIR):
+    """
+    Download PDFs from a list of URLs.
     
-    # Separate file arguments from flags
-    headless = "--headless" in sys.argv
-    url_files = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    Args:
+        urls: List of PDF URLs
+        output_dir: Directory to save downloaded PDFs (default: "./pdfs")
+        headless: Run browser in headless mode (default: False, experimental)
+        workers: Number of concurrent downloads (default: 8)
+        rate: Maximum PDF requests per second, or None for no limit (default: 5.0)
+        profile_dir: Chrome profile directory kept between runs, or None to borrow
+            a browser from the shared pool (default: ~/.epscraper-chrome)
     
-    if not url_files:
-        print("Error: No URL files specified")
-        sys.exit(1)
+    Returns:
+        int: Number of successfully downloaded PDFs
     
+    Example:
+        >>> from epscraper.superdownloader import download_pdfs_from_list
+        >>> download_pdfs_from_list(["https://www.justice.gov/epstein/files/DataSet%205/EFTA00008418.pdf"])
+    """
+    with PDFDownloader(output_dir=output_dir, headless=headless, workers=workers, rate=rate,
+                       profile_dir=profile_dir) as downloader:
+        return downloader.download_urls(urls)
+
+
+def main():
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+
+    parser = argparse.ArgumentParser(
+        description="Download PDFs listed in URL files",
+        epilog="Examples:\n"
+               "  python superdownloader.py urls.txt\n"
+               "  python superdownloader.py urls1.txt urls2.txt urls3.txt\n"
+               "\n"
+               "Note: By default, the browser runs in visible mode due to Chrome/Selenium limitations.\n"
+               "When processing multiple files, you only need to pass the CAPTCHA once at the start.",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "url_files",
+        nargs="+",
+        metavar="url_file",
+        help="Text file(s) containing URLs, one per line"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run in headless mode (experimental, may not work)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of concurrent downloads (default: {DEFAULT_WORKERS})"
+    )
+
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+
     # Check all files exist
-    for url_file in url_files:
+    for url_file in args.url_files:
         if not os.path.exists(url_file):
-            print(f"Error: File '{url_file}' not found")
-            sys.exit(1)
+            parser.error(f"File '{url_file}' not found")
     
     # Use the public API function
     try:
-        success_count = download_pdfs(url_files, headless=headless)
+        success_count = download_pdfs(args.url_files, headless=args.headless, workers=args.workers)
         sys.exit(0 if success_count > 0 else 1)
     except Exception as e:
         print(f"Fatal error: {e}")
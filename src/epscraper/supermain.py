@@ -23,9 +23,11 @@ This will:
 
 import sys
 import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from epscraper.superscraper import scrape_pdf_urls
+from epscraper.superscraper import HTTP_CACHE_FILE, SCRAPE_WORKERS, is_published, scrape_many
 from epscraper.superdownloader import download_pdfs
 
 
@@ -39,18 +41,13 @@ def load_downloaded_datasets(filename='data/downloaded.txt'):
     Returns:
         Set of data set numbers that have been downloaded
     """
-    downloaded = set()
-    
     if not os.path.exists(filename):
-        return downloaded
+        return set()
     
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.isdigit():
-                downloaded.add(int(line))
+    with open(filename, 'rb') as f:
+        data = f.read()
     
-    return downloaded
+    return {int(token) for token in data.split() if token.isdigit()}
 
 
 def save_downloaded_dataset(dataset_num, filename='data/downloaded.txt'):
@@ -61,14 +58,28 @@ def save_downloaded_dataset(dataset_num, filename='data/downloaded.txt'):
         dataset_num: The data set number that was downloaded
         filename: Path to the downloaded tracking file
     """
+    save_downloaded_datasets([dataset_num], filename)
+
+
+def save_downloaded_datasets(dataset_nums, filename='data/downloaded.txt'):
+    """
+    Register several data set numbers as downloaded in a single write.
+
+    Args:
+        dataset_nums: The data set numbers that were downloaded
+        filename: Path to the downloaded tracking file
+    """
+    if not dataset_nums:
+        return
+
     # Ensure directory exists
     Path(filename).parent.mkdir(exist_ok=True)
     
     with open(filename, 'a') as f:
-        f.write(f'{dataset_num}\n')
+        f.write('\n'.join(map(str, dataset_nums)) + '\n')
 
 
-def generate_dataset_urls(start, end, skip_downloaded=True):
+def generate_dataset_urls(start, end, skip_downloaded=True, skip_unpublished=True):
     """
     Generate URLs for data sets in the specified range.
 
@@ -76,6 +87,7 @@ def generate_dataset_urls(start, end, skip_downloaded=True):
         start: Starting data set number (inclusive)
         end: Ending data set number (inclusive)
         skip_downloaded: Whether to skip already downloaded data sets
+        skip_unpublished: Whether to skip data sets whose page does not exist yet
 
     Returns:
         Tuple of (list of URLs to data set pages, list of dataset numbers)
@@ -93,16 +105,27 @@ def generate_dataset_urls(start, end, skip_downloaded=True):
         urls.append(base_url.format(i))
         dataset_numbers.append(i)
 
+    if skip_unpublished and urls:
+        # No more threads than the session keeps connections for
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+            published = list(executor.map(is_published, urls))
+        for dataset_num, exists in zip(dataset_numbers, published):
+            if not exists:
+                print(f"  Skipping data set {dataset_num} (not published)")
+        urls = [url for url, exists in zip(urls, published) if exists]
+        dataset_numbers = [num for num, exists in zip(dataset_numbers, published) if exists]
+
     return urls, dataset_numbers
 
 
-def scrape_all_pdfs(dataset_urls, dataset_numbers):
+def scrape_all_pdfs(dataset_urls, dataset_numbers, cache_file=None):
     """
     Scrape all data set pages to extract PDF URLs.
 
     Args:
         dataset_urls: List of data set page URLs to scrape
         dataset_numbers: List of corresponding data set numbers
+        cache_file: Path to the HTTP cache file, or None to disable caching
 
     Returns:
         Dict mapping dataset number to list of PDF URLs
@@ -111,9 +134,9 @@ def scrape_all_pdfs(dataset_urls, dataset_numbers):
 
     print(f"Scraping {len(dataset_urls)} data set pages...\n")
 
-    for i, (url, dataset_num) in enumerate(zip(dataset_urls, dataset_numbers), 1):
-        print(f"[{i}/{len(dataset_urls)}] Scraping data set {dataset_num}: {url}")
-        pdf_urls = scrape_pdf_urls(url)
+    results = scrape_many(dataset_urls, cache_file=cache_file)
+    for i, (url, dataset_num, pdf_urls) in enumerate(zip(dataset_urls, dataset_numbers, results), 1):
+        print(f"[{i}/{len(dataset_urls)}] Scraped data set {dataset_num}: {url}")
         print(f"  Found {len(pdf_urls)} PDF URLs")
         pdfs_by_dataset[dataset_num] = pdf_urls
         print()
@@ -126,21 +149,22 @@ def save_urls_to_file(urls, filename='data/all_pdfs.txt'):
     Save PDF URLs to a file.
 
     Args:
-        urls: List of PDF URLs
+        urls: Collection of PDF URLs (any sized iterable, e.g. a list or dict)
         filename: Output file path
     """
     # Ensure directory exists
     Path(filename).parent.mkdir(exist_ok=True)
 
     with open(filename, 'w') as f:
-        for url in urls:
-            f.write(f'{url}\n')
+        f.writelines(f'{url}\n' for url in urls)
 
     print(f"Saved {len(urls)} PDF URLs to {filename}\n")
 
 
 def main():
     """Main function to orchestrate the download process."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+
     if len(sys.argv) != 3:
         print("Usage: python src/supermain.py <start> <end>")
         print()
@@ -170,12 +194,19 @@ def main():
     print(f"Generated {len(dataset_urls)} data set URLs to process\n")
 
     if not dataset_urls:
-        print("All data sets in this range have already been downloaded. Exiting.")
+        downloaded = load_downloaded_datasets()
+        in_range = range(start, end + 1)
+        if all(i in downloaded for i in in_range):
+            print("All data sets in this range have already been downloaded. Exiting.")
+        elif not any(i in downloaded for i in in_range):
+            print("None of the data sets in this range have been published yet. Exiting.")
+        else:
+            print("All data sets in this range have either been downloaded already or not been published yet. Exiting.")
         sys.exit(0)
 
     # Step 2: Scrape all pages to get PDF URLs
     print("Step 2: Scraping all data set pages for PDF URLs...")
-    pdfs_by_dataset = scrape_all_pdfs(dataset_urls, dataset_numbers)
+    pdfs_by_dataset = scrape_all_pdfs(dataset_urls, dataset_numbers, HTTP_CACHE_FILE)
     
     total_pdfs = sum(len(urls) for urls in pdfs_by_dataset.values())
     print(f"Total PDF URLs found: {total_pdfs}\n")
@@ -184,10 +215,14 @@ def main():
         print("No PDF URLs found. Exiting.")
         sys.exit(0)
 
-    # Save all URLs to file for reference
-    all_pdf_urls = []
-    for dataset_num in dataset_numbers:
-        all_pdf_urls.extend(pdfs_by_dataset[dataset_num])
+    # Save all URLs to file for reference. The same PDF may be listed on
+    # several pages; download it only once
+    all_pdf_urls = dict.fromkeys(
+        url for dataset_num in dataset_numbers for url in pdfs_by_dataset[dataset_num]
+    )
+    if len(all_pdf_urls) < total_pdfs:
+        print(f"Removed {total_pdfs - len(all_pdf_urls)} duplicate PDF URLs\n")
+        total_pdfs = len(all_pdf_urls)
     
     urls_file = 'data/all_pdfs.txt'
     save_urls_to_file(all_pdf_urls, urls_file)
@@ -201,8 +236,7 @@ def main():
 
         # Register all data sets as downloaded after successful download
         print("\nRegistering downloaded data sets...")
-        for dataset_num in dataset_numbers:
-            save_downloaded_dataset(dataset_num)
+        save_downloaded_datasets(dataset_numbers)
         print(f"Registered {len(dataset_numbers)} data sets as downloaded")
 
         print(f"\n=== Complete ===")
@@ -7,34 +7,92 @@ instrs/ocr_instructions.md
 
 Workflow:
 1. Reads PDF files from the directory `pdfs`
-2. Uses the module `src.ocr` to perform OCR
+2. Uses the module `src.ocr` to take the text of each page from its
+   embedded text layer where there is one, and to OCR the other pages
 3. Outputs text files to `texts` directory with .txt extension
 4. Skips already converted files
 5. Marks empty/image-only files as "empty file"
 """
 
 import os
+import sys
+import time
 import logging
+import multiprocessing
+from functools import partial
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from epscraper.ocr import get_text_from_pdf
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from epscraper.ocr import CACHE_DIR, DEFAULT_DPI, MIN_PAGE_TEXT_CHARS, get_text_from_pdf, warm_up
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+# Number of PDFs a worker process handles before it is replaced (Python 3.11+)
+MAX_TASKS_PER_CHILD = 8
 
-def process_pdf(pdf_path, output_dir, language='eng'):
+# Seconds between progress reports while PDFs are being processed
+PROGRESS_INTERVAL = 5
+
+# Leave one core free for the parent process and the system
+DEFAULT_CORES = max(1, (os.cpu_count() or 2) - 1)
+
+
+def _init_worker(language, log_level):
+    """
+    Prepare a worker process for OCR.
+
+    Spawned workers start without any logging configuration, so it is set
+    up again with the level of the parent process.
+
+    Tesseract is run single-threaded: parallelism comes from the process
+    pool, and letting every Tesseract process also spawn one OpenMP thread
+    per core oversubscribes the CPU. The OCR modules and language data are
+    loaded up front, so the first PDF of each worker does not pay for it.
+
+    Args:
+        language: Language code for Tesseract
+        log_level: Logging level of the parent process
+    """
+    logging.basicConfig(level=log_level, format=LOG_FORMAT, force=True)
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    os.environ['OMP_NUM_THREADS'] = '1'
+    warm_up(language)
+
+
+def _write_output(output_file, text):
+    """
+    Write a text output file atomically.
+
+    The text is written to a partial file that is renamed into place, so
+    an interrupted run never leaves a truncated output file that would be
+    taken for an already converted PDF.
+
+    Args:
+        output_file: Path of the text file
+        text: The text to write
+    """
+    part_file = output_file.with_name(output_file.name + '.part')
+    part_file.write_bytes(text.encode('utf-8'))
+    os.replace(part_file, output_file)
+
+
+def process_pdf(pdf_path, output_dir, language='eng', force_ocr=False, dpi=DEFAULT_DPI, cache_dir=None):
     """
-    Process a single PDF file and extract text using OCR.
+    Process a single PDF file and extract its text.
+
+    Pages with a text layer are converted directly from it; the others
+    are converted using OCR.
 
     Args:
         pdf_path: Path to the PDF file
         output_dir: Directory to save the text output
         language: Language code for Tesseract (default: 'eng')
+        force_ocr: Use OCR even for pages with a text layer (default: False)
+        dpi: Resolution to rasterise pages at for OCR (default: DEFAULT_DPI)
+        cache_dir: Directory to cache OCR results in, e.g. CACHE_DIR, or
+            None to disable the cache (default: None)
 
     Returns:
         True if processed successfully, False if skipped
@@ -44,16 +102,15 @@ def process_pdf(pdf_path, output_dir, language='eng'):
 
     # Check if already converted
     if output_file.exists():
-        logger.info(f'Skipping {pdf_file.name} - already converted')
+        logger.debug(f'Skipping {pdf_file.name} - already converted')
         return False
 
-    logger.info(f'Processing {pdf_file.name}...')
-
     try:
         # Log before starting conversion to identify hangs
-        logger.info(f'Starting OCR conversion for {pdf_file.name}')
-        # Extract text using OCR
-        text = get_text_from_pdf(str(pdf_path), language)
+        logger.debug(f'Starting conversion for {pdf_file.name}')
+        # Extract text from the text layer, and using OCR where it is missing
+        text = get_text_from_pdf(str(pdf_path), language, dpi=dpi, cache_dir=cache_dir,
+                                 min_page_chars=None if force_ocr else MIN_PAGE_TEXT_CHARS)
 
         # Check if meaningful text was extracted
         # Strip whitespace and check if there's actual content
@@ -63,21 +120,66 @@ def process_pdf(pdf_path, output_dir, language='eng'):
             text = 'empty file'
 
         # Write to output file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(text)
+        _write_output(output_file, text)
 
-        logger.info(f'Successfully converted {pdf_file.name} to {output_file.name}')
+        logger.debug(f'Successfully converted {pdf_file.name} to {output_file.name}')
         return True
 
     except Exception as e:
         logger.error(f'Error processing {pdf_file.name}: {e}')
         # Write error marker
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('empty file')
+        _write_output(output_file, 'empty file')
         return False
 
 
-def process_all_pdfs(pdf_dir='pdfs', output_dir='texts', language='eng', num_cores=5):
+def _list_pdfs(pdf_dir):
+    """
+    List the PDF files in a directory, largest first.
+
+    Largest first, so that long OCR jobs do not end up as stragglers. The
+    names and sizes come from a single scan of the directory.
+
+    Args:
+        pdf_dir: Directory containing PDF files
+
+    Returns:
+        List of paths to the PDF files, or an empty list if the directory
+        does not exist
+    """
+    try:
+        with os.scandir(pdf_dir) as entries:
+            pdfs = [(entry.stat().st_size, entry.path) for entry in entries
+                    if entry.name.endswith('.pdf') and entry.is_file()]
+    except FileNotFoundError:
+        return []
+    pdfs.sort(reverse=True)
+    return [Path(path) for _, path in pdfs]
+
+
+def _run_bounded(executor, fn, items, max_pending):
+    """
+    Submit a job per item, keeping at most max_pending jobs queued.
+
+    Args:
+        executor: The executor to submit the jobs to
+        fn: Function called with each item
+        items: The items to process, in submission order
+        max_pending: Maximum number of submitted jobs not yet completed
+
+    Yields:
+        The futures of the jobs, as they complete
+    """
+    pending = set()
+    for item in items:
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from done
+        pending.add(executor.submit(fn, item))
+    yield from as_completed(pending)
+
+
+def process_all_pdfs(pdf_dir='pdfs', output_dir='texts', language='eng', num_cores=None,
+                     force_ocr=False, dpi=DEFAULT_DPI, cache_dir=None):
     """
     Process all PDF files in the specified directory.
 
@@ -85,19 +187,24 @@ def process_all_pdfs(pdf_dir='pdfs', output_dir='texts', language='eng', num_cor
         pdf_dir: Directory containing PDF files (default: 'pdfs')
         output_dir: Directory to save text outputs (default: 'texts')
         language: Language code for Tesseract (default: 'eng')
-        num_cores: Number of parallel processes (default: 5)
+        num_cores: Number of parallel processes (default: CPU count minus one)
+        force_ocr: Use OCR even for pages with a text layer (default: False)
+        dpi: Resolution to rasterise pages at for OCR (default: DEFAULT_DPI)
+        cache_dir: Directory to cache OCR results in, e.g. CACHE_DIR, or
+            None to disable the cache (default: None)
 
     Returns:
         Dictionary with processing statistics
     """
     pdf_path = Path(pdf_dir)
     output_path = Path(output_dir)
+    num_cores = num_cores or DEFAULT_CORES
 
     # Ensure output directory exists
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Get all PDF files
-    pdf_files = list(pdf_path.glob('*.pdf'))
+    pdf_files = _list_pdfs(pdf_path)
 
     if not pdf_files:
         logger.warning(f'No PDF files found in {pdf_dir}')
@@ -109,20 +216,38 @@ def process_all_pdfs(pdf_dir='pdfs', output_dir='texts', language='eng', num_cor
     processed = 0
     skipped = 0
 
-    with ProcessPoolExecutor(max_workers=num_cores) as executor:
-        # Submit all tasks
-        future_to_pdf = {
-            executor.submit(process_pdf, pdf_file, output_path, language): pdf_file
-            for pdf_file in sorted(pdf_files)
-        }
-
-        # Process results as they complete
-        for future in as_completed(future_to_pdf):
+    executor_options = {}
+    if sys.version_info >= (3, 11):
+        # Recycle workers to release memory held on to by Tesseract and
+        # Poppler. This cannot be combined with fork, so workers are
+        # started with spawn: each one imports the package afresh, and the
+        # calling script is imported again in each worker, so it needs an
+        # `if __name__ == '__main__':` guard
+        executor_options['max_tasks_per_child'] = MAX_TASKS_PER_CHILD
+        executor_options['mp_context'] = multiprocessing.get_context('spawn')
+
+    log_level = logging.getLogger().getEffectiveLevel()
+    with ProcessPoolExecutor(max_workers=num_cores, initializer=_init_worker,
+                             initargs=(language, log_level), **executor_options) as executor:
+        # Submit the tasks as workers free up, with a few queued per worker
+        convert = partial(process_pdf, output_dir=output_path, language=language,
+                          force_ocr=force_ocr, dpi=dpi, cache_dir=cache_dir)
+        futures = _run_bounded(executor, convert, pdf_files, 2 * num_cores)
+
+        # Process results as they complete, reporting progress periodically
+        # rather than logging every file
+        last_report = time.monotonic()
+        for future in futures:
             if future.result():
                 processed += 1
             else:
                 skipped += 1
 
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                logger.info(f'Progress: {processed + skipped}/{len(pdf_files)} PDFs done')
+                last_report = now
+
     stats = {
         'total': len(pdf_files),
         'processed': processed,
@@ -160,8 +285,24 @@ def main():
     parser.add_argument(
         '--cores',
         type=int,
-        default=5,
-        help='Number of parallel cores to use (default: 5)'
+        default=DEFAULT_CORES,
+        help=f'Number of parallel cores to use (default: {DEFAULT_CORES})'
+    )
+    parser.add_argument(
+        '--force-ocr',
+        action='store_true',
+        help='Use OCR even for pages with an embedded text layer'
+    )
+    parser.add_argument(
+        '--dpi',
+        type=int,
+        default=DEFAULT_DPI,
+        help=f'Resolution to rasterise pages at for OCR; lower is faster (default: {DEFAULT_DPI})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not read or write cached OCR results (cached in: {CACHE_DIR})'
     )
     parser.add_argument(
         '--verbose',
@@ -174,7 +315,9 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    stats = process_all_pdfs(args.pdf_dir, args.output_dir, args.language, args.cores)
+    stats = process_all_pdfs(args.pdf_dir, args.output_dir, args.language, args.cores,
+                             args.force_ocr, args.dpi,
+                             cache_dir=None if args.no_cache else CACHE_DIR)
 
     print(f'\nSummary:')
     print(f'  Total PDFs: {stats["total"]}')
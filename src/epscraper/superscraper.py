@@ -4,74 +4,236 @@ Web scraper module for extracting PDF URLs from HTML pages.
 See instrs/scraper_instructions.md for detailed requirements.
 """
 
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from urllib3.exceptions import HTTPError as TransportError
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlsplit
+
+# Matches hrefs pointing to a PDF file, also with a query string or fragment
+_PDF_HREF_RE = re.compile(r'\.pdf(?:$|[?#])', re.IGNORECASE)
+
+# Selects the href of every anchor as a plain string
+_HREF_XPATH = etree.XPath('//a/@href', smart_strings=False)
+
+# Number of pages fetched concurrently by scrape_many
+SCRAPE_WORKERS = 4
+
+# Separate connect and read timeouts, in seconds
+TIMEOUT = (5, 30)
+
+# Shared session, so consecutive pages reuse the keep-alive connection
+# instead of doing a new TCP and TLS handshake per page. Transient
+# failures are retried with backoff instead of aborting the scrape
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=SCRAPE_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Validators and PDF URLs of previously scraped pages, for conditional
+# requests. Used by the command line scripts; library callers opt in by
+# passing a cache file
+HTTP_CACHE_FILE = 'data/http_cache.json'
+
+# Stored with each cache entry, so links found with an older link filter
+# are not returned once the filter changes
+_CACHE_FILTER = f'{_PDF_HREF_RE.pattern}/{_PDF_HREF_RE.flags}'
+
+# Guards read-modify-write of the cache file when pages are scraped concurrently
+_CACHE_LOCK = threading.Lock()
+
+
+def _load_http_cache(filename):
+    """Load the HTTP cache, or return an empty cache if there is none."""
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _update_http_cache(filename, url, entry):
+    """Store the cache entry for a URL, replacing the cache file atomically."""
+    with _CACHE_LOCK:
+        cache = _load_http_cache(filename)
+        cache[url] = entry
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = f'{filename}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, filename)
 
 
-def scrape_pdf_urls(url):
+def scrape_pdf_urls(url, cache_file=None):
     """
     Scrape PDF URLs from a given web page.
+
+    If the page has been scraped before, it is requested conditionally
+    with its ETag / Last-Modified validators, and the cached PDF URLs are
+    returned without parsing if the server reports it unchanged.
     
     Args:
         url: The URL to scrape
+        cache_file: Path to the HTTP cache file, e.g. HTTP_CACHE_FILE, or
+            None to disable caching (default: None)
         
     Returns:
         A list of full PDF URLs found on the page
     """
+    cached = _load_http_cache(cache_file).get(url) if cache_file else None
+    if cached and cached.get('filter') != _CACHE_FILTER:
+        cached = None
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        response = _SESSION.get(url, headers=headers, timeout=TIMEOUT, stream=True)
     except requests.RequestException as e:
         print(f'Error fetching URL {url}: {e}')
         return []
-    
-    soup = BeautifulSoup(response.text, 'html.parser')
+
+    with response:
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            print(f'Error fetching URL {url}: {e}')
+            return []
+
+        if response.status_code == 304 and cached:
+            return list(cached['pdf_links'])
+
+        # Feed the body to the parser as it arrives, instead of holding the
+        # whole page in memory first
+        response.raw.decode_content = True
+        try:
+            tree = etree.parse(response.raw, etree.HTMLParser())
+        except TransportError as e:
+            print(f'Error fetching URL {url}: {e}')
+            return []
+
+    if tree.getroot() is None:
+        # Empty document
+        return []
     pdf_urls = []
+
+    # Parse the page URL once for the common absolute and root-relative links
+    base = urlsplit(url)
+    prefix = f'{base.scheme}://{base.netloc}'
     
-    # Find all anchor tags
-    for link in soup.find_all('a', href=True):
-        href = link['href']
-        
-        # Check if the link points to a PDF file
-        if href.endswith('.pdf'):
-            # Convert relative URLs to absolute URLs
+    for href in _HREF_XPATH(tree):
+        if not _PDF_HREF_RE.search(href):
+            continue
+
+        # Convert relative URLs to absolute URLs
+        if href.startswith(('http://', 'https://')):
+            full_url = href
+        elif href.startswith('/') and not href.startswith('//'):
+            full_url = prefix + href
+        else:
             full_url = urljoin(url, href)
-            pdf_urls.append(full_url)
+        pdf_urls.append(full_url)
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if cache_file and (etag or last_modified):
+        _update_http_cache(cache_file, url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'filter': _CACHE_FILTER,
+            'pdf_links': pdf_urls
+        })
     
     return pdf_urls
 
 
+def is_published(url):
+    """
+    Check with a HEAD request whether a page exists.
+
+    Uses the scraper's session, so the connections are reused for
+    scraping the page afterwards, and transient errors are retried.
+
+    Args:
+        url: The page URL
+
+    Returns:
+        False if the server reports the page as missing, True otherwise
+    """
+    try:
+        response = _SESSION.head(url, allow_redirects=True, timeout=TIMEOUT)
+    except requests.RequestException:
+        # Leave it to the scraper to report network problems
+        return True
+    return response.status_code not in (404, 410)
+
+
+def scrape_many(urls, max_workers=SCRAPE_WORKERS, cache_file=None):
+    """
+    Scrape PDF URLs from several web pages concurrently.
+
+    Args:
+        urls: The URLs to scrape
+        max_workers: Number of pages fetched at the same time
+        cache_file: Path to the HTTP cache file, e.g. HTTP_CACHE_FILE, or
+            None to disable caching (default: None)
+
+    Yields:
+        The list of PDF URLs found on each page, in the order of urls
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(lambda url: scrape_pdf_urls(url, cache_file), urls)
+
+
 def save_urls_to_file(urls, filename='data/urls.txt'):
     """
     Save a list of URLs to a file, one URL per line.
     
+    Duplicate URLs, e.g. a PDF linked twice on the same page, are written
+    only once, keeping the first occurrence.
+    
     Args:
         urls: List of URLs to save
         filename: Output file path (default: 'data/urls.txt')
     """
+    urls = list(dict.fromkeys(urls))
     try:
         with open(filename, 'w') as f:
-            for url in urls:
-                f.write(f'{url}\n')
+            f.writelines(f'{url}\n' for url in urls)
         print(f'Saved {len(urls)} URLs to {filename}')
     except IOError as e:
         print(f'Error writing to file {filename}: {e}')
 
 
-def scrape_and_save(url, filename='data/urls.txt'):
+def scrape_and_save(url, filename='data/urls.txt', cache_file=None):
     """
     Scrape PDF URLs from a webpage and save them to a file.
     
     Args:
         url: The URL to scrape
         filename: Output file path (default: 'data/urls.txt')
+        cache_file: Path to the HTTP cache file, or None to disable caching
         
     Returns:
         List of PDF URLs found
     """
     print(f'Scraping {url}...')
-    urls = scrape_pdf_urls(url)
+    urls = scrape_pdf_urls(url, cache_file)
     print(f'Found {len(urls)} PDF URLs')
     
     if urls:
@@ -84,7 +246,7 @@ def main():
     """Main function to demonstrate the scraper."""
     test_url = 'https://www.justice.gov/epstein/doj-disclosures/data-set-5-files'
     
-    urls = scrape_and_save(test_url)
+    urls = scrape_and_save(test_url, cache_file=HTTP_CACHE_FILE)
     
     if urls:
         print(f'\nFirst 5 URLs:')
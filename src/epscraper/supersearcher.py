@@ -11,6 +11,9 @@ handle JavaScript-based search functionality and age verification.
 Public API:
     search_pdfs(search_string, output_file=None)
         Main function to search and extract PDF URLs.
+
+    search_pdfs_batch(search_strings, max_workers=4)
+        Run several searches concurrently, each in its own browser.
     
     PDFSearcher()
         Context manager class for advanced usage.
@@ -27,21 +30,51 @@ Command-line usage:
 
 import os
 import sys
-import time
-import ssl
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Workaround for SSL certificate issues on macOS
-ssl._create_default_https_context = ssl._create_unverified_context
+from epscraper.browser import acquire_driver
+
+
+__all__ = ['search_pdfs', 'search_pdfs_batch', 'PDFSearcher']
+
+# Returns the next page control in the pagination bar: an enabled button,
+# or else a link, whose text is "next", ">", "›" or "»"
+_FIND_NEXT_PAGE_SCRIPT = '''
+const pagination = document.getElementById('pagination');
+if (!pagination) {
+    return null;
+}
+const isNext = el => /next|>|›|»/i.test(el.innerText);
+const controls = [...pagination.querySelectorAll('button:not([disabled])'),
+                  ...pagination.querySelectorAll('a')];
+return controls.find(isNext) || null;
+'''
 
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+# Returns the targets of the PDF links in the element given as argument,
+# or else in the results container. Like superscraper's link filter, this
+# also accepts links with a query string or fragment, in any case
+_PDF_LINKS_SCRIPT = '''
+const root = arguments[0] || document.getElementById('results');
+if (!root) {
+    return [];
+}
+return Array.from(root.querySelectorAll('a[href]'), a => a.href)
+    .filter(href => /\\.pdf(?:$|[?#])/i.test(href));
+'''
 
+# Requests the searcher blocks in its browser, as it only reads links
+_BLOCKED_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+                 '*.woff', '*.woff2', '*.ttf']
 
-__all__ = ['search_pdfs', 'PDFSearcher']
+# Default number of searches run at the same time by search_pdfs_batch.
+# Kept small, since each one is a full browser hitting justice.gov
+BATCH_WORKERS = 4
+
+# Default for the most result pages visited when no end page is given,
+# in case the pagination never runs out
+MAX_PAGES = 50
 
 
 class PDFSearcher:
@@ -61,38 +94,65 @@ class PDFSearcher:
         self.headless = headless
         self.driver = None
         self.search_url = 'https://www.justice.gov/epstein/search'
+        self._driver_context = None
         
     def __enter__(self):
-        """Context manager entry."""
-        options = uc.ChromeOptions()
-        if self.headless:
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--no-sandbox')
-        
-        # Use version 144 to match current Chrome
-        self.driver = uc.Chrome(options=options, version_main=144)
+        """Context manager entry - borrow a browser from the pool."""
+        self._driver_context = acquire_driver(self.headless)
+        self.driver = self._driver_context.__enter__()
+        self._block_urls(_BLOCKED_URLS)
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - cleanup resources."""
-        if self.driver:
-            self.driver.quit()
+        """Context manager exit - hand the browser back to the pool."""
+        if self._driver_context:
+            # The next user of the browser may need the images, e.g. for a CAPTCHA
+            self._block_urls([])
+            self._driver_context.__exit__(exc_type, exc_val, exc_tb)
+            self._driver_context = None
+            self.driver = None
+    
+    def _block_urls(self, patterns):
+        """
+        Stop the browser from loading URLs matching the given patterns.
+        
+        The search only reads the result links, so images and fonts are
+        skipped to make each results page load faster.
+        
+        Args:
+            patterns: URL patterns with '*' wildcards, or [] to block nothing
+        """
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as e:
+            print(f'Could not set blocked URLs: {e}')
     
     def handle_age_verification(self):
         """Handle age verification if present."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
         try:
             yes_button = WebDriverWait(self.driver, 3).until(
                 EC.element_to_be_clickable((By.ID, 'age-button-yes'))
             )
             print('Age verification required, clicking "Yes" button...')
             yes_button.click()
-            time.sleep(1)
-            return True
         except TimeoutException:
             print('No age verification required')
             return False
+
+        # The search field appears once the age gate is gone
+        try:
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.ID, 'searchInput'))
+            )
+        except TimeoutException:
+            print('Search field did not appear after age verification')
+        return True
     
     def perform_search(self, search_string):
         """
@@ -101,6 +161,11 @@ class PDFSearcher:
         Args:
             search_string: The search query to execute
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
         print(f'Performing search for: "{search_string}"')
         
         # Find search input field
@@ -111,6 +176,10 @@ class PDFSearcher:
             search_input.clear()
             search_input.send_keys(search_string)
             
+            # Results of an earlier search on this page must not be
+            # mistaken for the new ones
+            old_results = self.driver.find_elements(By.CSS_SELECTOR, '#results a')
+            
             # Click search button
             search_button = self.driver.find_element(By.ID, 'searchButton')
             # Use JavaScript click to avoid interception issues
@@ -118,12 +187,76 @@ class PDFSearcher:
             
             # Wait for results to load
             print('Waiting for search results to load...')
-            time.sleep(3)
+            if not self._wait_for_new_results(old_results):
+                print('Search results were not updated')
             
         except (TimeoutException, NoSuchElementException) as e:
             print(f'Error performing search: {e}')
             raise
     
+    def _wait_for_results(self, timeout=10):
+        """Wait until PDF links are shown in the results container."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script(_PDF_LINKS_SCRIPT)
+            )
+        except TimeoutException:
+            print('No PDF links appeared in the results')
+    
+    def _wait_for_new_results(self, old_results):
+        """
+        Wait for the results shown before an action to be replaced.
+        
+        Args:
+            old_results: The result links found before the action
+            
+        Returns:
+            True if the old results were replaced, False otherwise
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        # The old result links go stale when new results replace them
+        if old_results:
+            try:
+                WebDriverWait(self.driver, 10).until(EC.staleness_of(old_results[0]))
+            except TimeoutException:
+                return False
+        self._wait_for_results()
+        return True
+    
+    def _click_and_wait(self, element):
+        """
+        Click a pagination control and wait for the next results page.
+        
+        Args:
+            element: The next page button or link
+            
+        Returns:
+            True if the results were replaced, False otherwise
+        """
+        from selenium.webdriver.common.by import By
+
+        old_results = self.driver.find_elements(By.CSS_SELECTOR, '#results a')
+        
+        print('Clicking next page...')
+        # Scroll to the control and use JavaScript click to avoid interception
+        self.driver.execute_script('arguments[0].scrollIntoView({block: "center"});', element)
+        try:
+            element.click()
+        except Exception:
+            # Fallback to JavaScript click
+            self.driver.execute_script('arguments[0].click();', element)
+        
+        if not self._wait_for_new_results(old_results):
+            print('Next page did not load')
+            return False
+        return True
+    
     def extract_pdf_urls(self):
         """
         Extract PDF URLs from the current results page.
@@ -131,6 +264,11 @@ class PDFSearcher:
         Returns:
             List of PDF URLs found on the page
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
         pdf_urls = []
         
         try:
@@ -139,16 +277,9 @@ class PDFSearcher:
                 EC.presence_of_element_located((By.ID, 'results'))
             )
             
-            # Find all links in the results
-            links = results_container.find_elements(By.TAG_NAME, 'a')
-            
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and href.endswith('.pdf'):
-                        pdf_urls.append(href)
-                except Exception as e:
-                    continue
+            # Let the browser select the PDF links and return their targets
+            # in one round trip instead of one get_attribute call per link
+            pdf_urls = self.driver.execute_script(_PDF_LINKS_SCRIPT, results_container)
             
             print(f'Found {len(pdf_urls)} PDF URLs on this page')
             
@@ -157,6 +288,18 @@ class PDFSearcher:
         
         return pdf_urls
     
+    def _find_next_control(self):
+        """
+        Find the control leading to the next results page.
+        
+        The pagination bar is searched in the browser with one script,
+        instead of a WebDriver round trip per button and attribute.
+        
+        Returns:
+            The enabled next page button or link, or None if there is none
+        """
+        return self.driver.execute_script(_FIND_NEXT_PAGE_SCRIPT)
+    
     def has_next_page(self):
         """
         Check if there is a next page button available.
@@ -164,97 +307,56 @@ class PDFSearcher:
         Returns:
             True if next page exists, False otherwise
         """
-        try:
-            # Look for pagination container
-            pagination = self.driver.find_element(By.ID, 'pagination')
-            
-            # Look for a "next" button or link that's not disabled
-            # Common patterns: button with text "Next", ">" or arrow
-            next_buttons = pagination.find_elements(By.TAG_NAME, 'button')
-            
-            for button in next_buttons:
-                text = button.text.lower()
-                if 'next' in text or '>' in text or '›' in text or '»' in text:
-                    # Check if button is enabled
-                    if button.is_enabled() and button.get_attribute('disabled') is None:
-                        return True
-            
-            # Also check for links
-            next_links = pagination.find_elements(By.TAG_NAME, 'a')
-            for link in next_links:
-                text = link.text.lower()
-                if 'next' in text or '>' in text or '›' in text or '»' in text:
-                    return True
-            
-            return False
-            
-        except NoSuchElementException:
-            return False
+        return self._find_next_control() is not None
     
-    def click_next_page(self):
-        """Click the next page button."""
+    def advance_to_next_page(self):
+        """
+        Move to the next results page, if there is one.
+        
+        Returns:
+            True if the next page was loaded, False if there is no next
+            page or it could not be loaded
+        """
         try:
-            pagination = self.driver.find_element(By.ID, 'pagination')
-            
-            # Try buttons first
-            next_buttons = pagination.find_elements(By.TAG_NAME, 'button')
-            for button in next_buttons:
-                text = button.text.lower()
-                if 'next' in text or '>' in text or '›' in text or '»' in text:
-                    if button.is_enabled() and button.get_attribute('disabled') is None:
-                        print('Clicking next page...')
-                        # Scroll to button and use JavaScript click to avoid interception
-                        self.driver.execute_script('arguments[0].scrollIntoView({block: "center"});', button)
-                        time.sleep(0.5)
-                        try:
-                            button.click()
-                        except Exception:
-                            # Fallback to JavaScript click
-                            self.driver.execute_script('arguments[0].click();', button)
-                        time.sleep(3)
-                        return True
-            
-            # Try links
-            next_links = pagination.find_elements(By.TAG_NAME, 'a')
-            for link in next_links:
-                text = link.text.lower()
-                if 'next' in text or '>' in text or '›' in text or '»' in text:
-                    print('Clicking next page...')
-                    # Scroll to link and use JavaScript click
-                    self.driver.execute_script('arguments[0].scrollIntoView({block: "center"});', link)
-                    time.sleep(0.5)
-                    try:
-                        link.click()
-                    except Exception:
-                        # Fallback to JavaScript click
-                        self.driver.execute_script('arguments[0].click();', link)
-                    time.sleep(3)
-                    return True
-            
-            return False
+            next_control = self._find_next_control()
+            if next_control is None:
+                return False
+            return self._click_and_wait(next_control)
             
         except Exception as e:
             print(f'Error clicking next page: {e}')
             return False
     
-    def search_and_extract(self, search_string, start_page=1, end_page=None):
+    # Former name, kept for existing callers
+    click_next_page = advance_to_next_page
+    
+    def search_and_extract(self, search_string, start_page=1, end_page=None, max_pages=MAX_PAGES):
         """
         Perform search and extract all PDF URLs across all pages.
         
         Args:
             search_string: The search query
             start_page: First page to extract from (default: 1)
-            end_page: Last page to extract from (default: None, meaning all pages)
+            end_page: Last page to extract from (default: None, meaning all
+                pages, up to max_pages pages)
+            max_pages: Most pages to extract from when no end page is given
+                (default: MAX_PAGES, None for no limit)
             
         Returns:
-            List of all PDF URLs found
+            List of all PDF URLs found, without duplicates
         """
-        all_urls = []
+        capped = end_page is None and max_pages is not None
+        if capped:
+            end_page = start_page + max_pages - 1
+        elif end_page is None:
+            end_page = float('inf')
+        
+        # PDF URLs in the order found; a dict drops the ones already seen
+        found_urls = {}
         
         # Navigate to search page
         print(f'Navigating to {self.search_url}...')
         self.driver.get(self.search_url)
-        time.sleep(2)
         
         # Handle age verification
         self.handle_age_verification()
@@ -266,59 +368,89 @@ class PDFSearcher:
         page_num = 1
         
         # Skip pages before start_page
-        while page_num < start_page and self.has_next_page():
+        while page_num < start_page:
             print(f'Skipping page {page_num}...')
-            if not self.click_next_page():
+            if not self.advance_to_next_page():
                 print(f'Could not reach page {start_page}')
-                return all_urls
+                return []
             page_num += 1
         
         # Extract URLs from start page
         print(f'Extracting from page {page_num}...')
         urls = self.extract_pdf_urls()
-        all_urls.extend(urls)
+        found_urls.update(dict.fromkeys(urls))
         
-        # Check for additional pages
-        while self.has_next_page():
-            # Stop if we've reached the end page
-            if end_page is not None and page_num >= end_page:
+        # Continue with the following pages until the end page, or the
+        # last page if that comes first
+        while page_num < end_page:
+            if not self.advance_to_next_page():
                 break
             
             page_num += 1
-            print(f'\nMoving to page {page_num}...')
-            
-            if not self.click_next_page():
-                break
+            print(f'\nExtracting from page {page_num}...')
             
             urls = self.extract_pdf_urls()
-            all_urls.extend(urls)
+            previous_count = len(found_urls)
+            found_urls.update(dict.fromkeys(urls))
+            
+            # A page of links that have all been seen before, such as the
+            # same page again, means the pagination has stalled or looped back
+            if urls and len(found_urls) == previous_count:
+                print('No new PDF URLs on this page, stopping')
+                break
+        else:
+            if capped and self.has_next_page():
+                print(f'Warning: stopped after {max_pages} pages although there are more; '
+                      f'raise the page limit to get them')
         
-        print(f'\nTotal PDF URLs found: {len(all_urls)}')
-        return all_urls
+        print(f'\nTotal PDF URLs found: {len(found_urls)}')
+        return list(found_urls)
+
+
+@functools.lru_cache(maxsize=256)
+def default_url_file(search_string):
+    """
+    Return the default URL file path for a search.
+    
+    Args:
+        search_string: The search query
+    
+    Returns:
+        'data/<search_string>_urls.txt' with spaces replaced by underscores
+    """
+    safe_search_string = search_string.replace(' ', '_')
+    return f'data/{safe_search_string}_urls.txt'
 
 
 def save_urls_to_file(urls, filename):
     """
-    Save URLs to a file, one per line.
+    Save URLs to a file, one per line, replacing any previous contents.
+    
+    Duplicate URLs are dropped, keeping the first occurrence, and nothing
+    is written if there are no URLs.
     
     Args:
         urls: List of URLs to save
         filename: Output file path
     """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+    
     # Ensure the data directory exists
     output_path = Path(filename)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        with open(filename, 'a') as f:
-            for url in urls:
-                f.write(f'{url}\n')
-        print(f'Appended {len(urls)} URLs to {filename}')
+        with open(filename, 'w') as f:
+            f.writelines(f'{url}\n' for url in urls)
+        print(f'Saved {len(urls)} URLs to {filename}')
     except IOError as e:
         print(f'Error writing to file {filename}: {e}')
 
 
-def search_pdfs(search_string, output_file=None, headless=False, start_page=1, end_page=None):
+def search_pdfs(search_string, output_file=None, headless=False, start_page=1, end_page=None,
+                max_pages=MAX_PAGES):
     """
     Search for PDFs and extract URLs.
     
@@ -328,7 +460,10 @@ def search_pdfs(search_string, output_file=None, headless=False, start_page=1, e
                     'data/<search_string>_urls.txt' with spaces replaced by underscores
         headless: Run browser in headless mode (default: False)
         start_page: First page to extract from (default: 1)
-        end_page: Last page to extract from (default: None, meaning all pages)
+        end_page: Last page to extract from (default: None, meaning all
+            pages, up to max_pages pages)
+        max_pages: Most pages to extract from when no end page is given
+            (default: MAX_PAGES, None for no limit)
     
     Returns:
         List of PDF URLs found
@@ -341,8 +476,7 @@ def search_pdfs(search_string, output_file=None, headless=False, start_page=1, e
     """
     # Generate default output filename if not provided
     if output_file is None:
-        safe_search_string = search_string.replace(' ', '_')
-        output_file = f'data/{safe_search_string}_urls.txt'
+        output_file = default_url_file(search_string)
     
     print(f'Search query: "{search_string}"')
     print(f'Output file: {output_file}')
@@ -352,7 +486,7 @@ def search_pdfs(search_string, output_file=None, headless=False, start_page=1, e
     print()
     
     with PDFSearcher(headless=headless) as searcher:
-        urls = searcher.search_and_extract(search_string, start_page, end_page)
+        urls = searcher.search_and_extract(search_string, start_page, end_page, max_pages)
         
         if urls:
             save_urls_to_file(urls, output_file)
@@ -362,50 +496,94 @@ def search_pdfs(search_string, output_file=None, headless=False, start_page=1, e
         return urls
 
 
-def main():
-    if len(sys.argv) < 2 or sys.argv[1] in ['--help', '-h', 'help']:
-        print('Usage: python supersearcher.py <search_string> [OPTIONS]')
-        print('\nOptions:')
-        print('  --output FILE      Output file path (default: data/<search_string>_urls.txt)')
-        print('  --pages START END  Extract pages START to END (inclusive, default: all pages)')
-        print('  --headless         Run in headless mode')
-        print('\nExamples:')
-        print('  python supersearcher.py "flight logs"')
-        print('  python supersearcher.py "email" --pages 10 20')
-        print('  python supersearcher.py "black book" --output data/blackbook.txt')
-        sys.exit(0 if len(sys.argv) > 1 else 1)
-    
-    # Parse arguments
-    search_string = sys.argv[1]
-    output_file = None
-    headless = '--headless' in sys.argv
-    start_page = 1
-    end_page = None
-    
-    # Check for custom output file
-    if '--output' in sys.argv:
-        try:
-            output_index = sys.argv.index('--output')
-            output_file = sys.argv[output_index + 1]
-        except (ValueError, IndexError):
-            print('Error: --output flag requires a filename')
-            sys.exit(1)
-    
-    # Check for page range
-    if '--pages' in sys.argv:
+def search_pdfs_batch(search_strings, headless=False, max_workers=BATCH_WORKERS, max_pages=MAX_PAGES):
+    """
+    Run several searches concurrently, each in its own browser.
+    
+    The URLs of each search are saved to its default URL file, as with
+    search_pdfs. A search that fails is reported and gives no URLs,
+    without stopping the others.
+    
+    Args:
+        search_strings: The search queries
+        headless: Run browsers in headless mode (default: False)
+        max_workers: Number of searches, and browsers, run at the same time
+        max_pages: Most pages to extract from per search (default:
+            MAX_PAGES, None for no limit)
+    
+    Returns:
+        Dict mapping each search string to the list of PDF URLs found
+    
+    Example:
+        >>> from supersearcher import search_pdfs_batch
+        >>> results = search_pdfs_batch(['flight logs', 'black book'])
+    """
+    def search(search_string):
         try:
-            pages_index = sys.argv.index('--pages')
-            start_page = int(sys.argv[pages_index + 1])
-            end_page = int(sys.argv[pages_index + 2])
-            if start_page < 1 or end_page < start_page:
-                print('Error: Invalid page range. START must be >= 1 and END must be >= START')
-                sys.exit(1)
-        except (ValueError, IndexError):
-            print('Error: --pages flag requires two integers (START END)')
-            sys.exit(1)
+            return search_pdfs(search_string, headless=headless, max_pages=max_pages)
+        except Exception as e:
+            print(f'Search for "{search_string}" failed: {e}')
+            return []
+    
+    search_strings = list(dict.fromkeys(search_strings))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(search_strings, executor.map(search, search_strings)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Search justice.gov/epstein and save the PDF URLs found',
+        epilog='Examples:\n'
+               '  python supersearcher.py "flight logs"\n'
+               '  python supersearcher.py "email" --pages 10 20\n'
+               '  python supersearcher.py "black book" --output data/blackbook.txt',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        'search_string',
+        help='The search query'
+    )
+    parser.add_argument(
+        '--output',
+        metavar='FILE',
+        help='Output file path (default: data/<search_string>_urls.txt)'
+    )
+    parser.add_argument(
+        '--pages',
+        nargs=2,
+        type=int,
+        metavar=('START', 'END'),
+        help='Extract pages START to END (inclusive, default: all pages, up to --max-pages)'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=MAX_PAGES,
+        metavar='N',
+        help=f'Most pages to extract from without --pages, 0 for no limit (default: {MAX_PAGES})'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Run in headless mode'
+    )
+
+    args = parser.parse_args()
+
+    search_string = args.search_string
+    output_file = args.output
+    headless = args.headless
+    start_page, end_page = args.pages if args.pages else (1, None)
+    if args.pages and (start_page < 1 or end_page < start_page):
+        parser.error('Invalid page range. START must be >= 1 and END must be >= START')
+    if args.max_pages < 0:
+        parser.error('--max-pages must be >= 0')
     
     try:
-        urls = search_pdfs(search_string, output_file, headless, start_page, end_page)
+        urls = search_pdfs(search_string, output_file, headless, start_page, end_page,
+                           args.max_pages or None)
         sys.exit(0 if urls else 1)
     except Exception as e:
         print(f'Fatal error: {e}')